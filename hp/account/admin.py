@@ -13,20 +13,31 @@
 # You should have received a copy of the GNU General Public License along with this project. If not, see
 # <http://www.gnu.org/licenses/>.
 
+import ipaddress
 import logging
+from itertools import islice
 
 from django.contrib import admin
 from django.contrib import messages
+from django.contrib.admin.utils import unquote
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
-from django.utils import timezone
+from django.db.models import BooleanField
+from django.db.models import Case
+from django.db.models import Prefetch
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.db.models import prefetch_related_objects
+from django.db.models.functions import Now
 from django.utils.translation import ugettext_lazy as _
 
 from django_object_actions import DjangoObjectActions
 from django_object_actions import takes_instance_or_queryset
 from reversion.admin import VersionAdmin
 
-from antispam.utils import normalize_email
+from core.admin import EstimatedCountPaginator
 from core.utils import version
 
 from .constants import PURPOSE_REGISTER
@@ -36,11 +47,15 @@ from .models import Confirmation
 from .models import GpgKey
 from .models import User
 from .models import UserLogEntry
+from .tasks import refresh_gpg_key
 from .tasks import resend_confirmations
 from .tasks import send_confirmation_task
 
 log = logging.getLogger(__name__)
 
+# Number of rows fetched at once by admin actions
+ACTION_CHUNK_SIZE = 500
+
 
 class ConfirmedFilter(admin.SimpleListFilter):
     title = _('confirmed email')
@@ -78,6 +93,15 @@ class CreatedInBackendFilter(admin.SimpleListFilter):
         return queryset
 
 
+class UserChangeList(ChangeList):
+    def get_queryset(self, request):
+        # Only fetch the columns actually displayed in the changelist. This is not done in
+        # UserAdmin.get_queryset() because the change form needs all fields.
+        return super().get_queryset(request).only(
+            'username', 'email', 'normalized_email', 'blocked', 'registered', 'confirmed',
+            'last_activity')
+
+
 @admin.register(User)
 class UserAdmin(DjangoObjectActions, VersionAdmin, BaseUserAdmin):
     actions = ['send_registration', 'block_users', ]
@@ -101,15 +125,37 @@ class UserAdmin(DjangoObjectActions, VersionAdmin, BaseUserAdmin):
     ordering = ('-registered', )
     readonly_fields = ['username', 'registered', 'blocked', 'normalized_email', ]
     search_fields = ['username', 'email', ]
+    show_full_result_count = False
+
+    def get_changelist(self, request, **kwargs):
+        return UserChangeList
+
+    def reversion_register(self, model, **kwargs):
+        if model is User:
+            # last_activity changes all the time and there is no point in storing it in revisions
+            kwargs['exclude'] = ('last_activity', )
+        super().reversion_register(model, **kwargs)
 
     def get_readonly_fields(self, request, obj=None):
         if obj is None:
             return []
         return super().get_readonly_fields(request, obj=obj)
 
+    def get_object(self, request, object_id, from_field=None):
+        # Cache the object on the request, so get_change_actions() and the change view itself do not
+        # fetch the same user twice.
+        cache = request.__dict__.setdefault('_useradmin_objects', {})
+        key = (object_id, from_field)
+        if key not in cache:
+            cache[key] = super().get_object(request, object_id, from_field=from_field)
+        return cache[key]
+
     def get_change_actions(self, request, object_id, form_url):
         actions = list(super().get_change_actions(request, object_id, form_url))
-        user = self.model.objects.get(pk=object_id)
+        user = self.get_object(request, unquote(object_id))
+        if user is None:
+            return actions  # the change view will display an appropriate message
+
         if user.blocked or not user.confirmed:
             # You cannot block a user that is not even confirmed (doesn't even exist in the backend!)
             actions.remove('block_user')
@@ -122,52 +168,76 @@ class UserAdmin(DjangoObjectActions, VersionAdmin, BaseUserAdmin):
     def send_registration(self, request, queryset):
         base_url = '%s://%s' % (request.scheme, request.get_host())
 
-        for user in queryset.filter(created_in_backend=False):
-            # Try to get any existing confirmation and resend it if it exists
-            conf = user.confirmations.filter(purpose=PURPOSE_REGISTER).first()
-            if conf is not None:
-                resend_confirmations.delay(conf.pk)
-
-            # No confirmation key exists (anymore), so we create a new one from existing data
-            else:
-                send_confirmation_task.delay(
-                    user_pk=user.pk, purpose=PURPOSE_REGISTER, language='en', to=user.email,
-                    base_url=base_url, hostname=user.domain)
+        confirmations = Prefetch('confirmations', to_attr='registration_confirmations',
+                                 queryset=Confirmation.objects.purpose(PURPOSE_REGISTER).order_by('pk'))
+        users = queryset.filter(created_in_backend=False).iterator(chunk_size=ACTION_CHUNK_SIZE)
+
+        resend = []
+        for chunk in iter(lambda: list(islice(users, ACTION_CHUNK_SIZE)), []):
+            # QuerySet.iterator() ignores prefetch_related(), so we prefetch for every chunk instead
+            prefetch_related_objects(chunk, confirmations)
+
+            for user in chunk:
+                # Try to get any existing confirmation and resend it if it exists
+                if user.registration_confirmations:
+                    resend.append(user.registration_confirmations[0].pk)
+
+                # No confirmation key exists (anymore), so we create a new one from existing data
+                else:
+                    send_confirmation_task.delay(
+                        user_pk=user.pk, purpose=PURPOSE_REGISTER, language='en', to=user.email,
+                        base_url=base_url, hostname=user.domain)
+
+        if resend:
+            resend_confirmations.delay(resend)
     send_registration.label = _('Send registration email')
     send_registration.short_description = _('Send new registration confirmations')
 
-    def save_model(self, request, obj, form, change):
-        obj.normalized_email = normalize_email(obj.email)
-        return super(UserAdmin, self).save_model(request, obj, form, change)
+    def _block(self, request, queryset):
+        """Block the given users and any other users with the same normalized email address."""
+
+        emails = list(queryset.exclude(email='').values_list('normalized_email', flat=True))
+        users = User.objects.filter(Q(pk__in=queryset.values('pk')) | Q(normalized_email__in=emails))
 
-    def block_user(self, request, obj):
         with version(user=request.user, comment='Blocked via admin interface'):
-            obj.block()
+            users.block()
 
-            # Block other users with the same normalized email address
-            if obj.email:
-                for user in User.objects.exclude(pk=obj.pk).filter(normalized_email=obj.normalized_email):
-                    user.block()
+    def block_user(self, request, obj):
+        self._block(request, User.objects.filter(pk=obj.pk))
 
     block_user.label = _('Block')
     block_user.short_description = _('Block this user')
 
     def block_users(self, request, queryset):
-        for user in queryset:
-            self.block_user(request, user)
+        self._block(request, queryset)
     block_users.short_description = _('Block selected users')
 
 
 @admin.register(UserLogEntry)
 class UserLogEntryAdmin(admin.ModelAdmin):
+    autocomplete_fields = ('user', )
     list_display = ('__str__', 'user', 'address', 'created')
+    list_select_related = ('user', )
+    paginator = EstimatedCountPaginator
     search_fields = ('message', 'address', 'user__username', 'user__email', )
+    show_full_result_count = False
     ordering = ('-created', )
 
+    def get_search_results(self, request, queryset, search_term):
+        # Searching for a complete IP address is the most common search. Match it exactly, so the lookup
+        # uses the index instead of scanning all log entries with LIKE '%...%'.
+        address = search_term.strip()
+        try:
+            ipaddress.ip_address(address)
+        except ValueError:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(address=address), False
+
 
 @admin.register(GpgKey)
 class GpgKeyAdmin(DjangoObjectActions, admin.ModelAdmin):
     actions = ['refresh']
+    autocomplete_fields = ('user', )
     change_actions = ['refresh', ]
     list_display = ('user', 'fingerprint', 'expires', 'valid', 'usable')
     list_select_related = ('user', )
@@ -177,27 +247,34 @@ class GpgKeyAdmin(DjangoObjectActions, admin.ModelAdmin):
 
     def valid(self, obj):
         return not obj.revoked  # just the inverse, more intuitive
+    valid.admin_order_field = '-revoked'
     valid.boolean = True
 
+    def get_queryset(self, request):
+        # Let the database decide if a key is usable, so we don't have to compare dates for every row
+        return super().get_queryset(request).annotate(_usable=Case(
+            When(revoked=True, then=Value(False)),
+            When(expires__isnull=True, then=Value(True)),
+            When(expires__gt=Now(), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ))
+
     def usable(self, obj):
-        now = timezone.now()
-        if obj.expires:
-            return obj.expires > now and not obj.revoked
-        else:
-            return not obj.revoked
+        return obj._usable
+    usable.admin_order_field = '_usable'
     usable.boolean = True
 
     @takes_instance_or_queryset
     def refresh(self, request, queryset):
-        for obj in queryset:
-            try:
-                obj.refresh()
-            except Exception as e:
-                log.exception(e)
-                messages.error(request, _('Error importing %(fingerprint)s: %(error)s') % {
-                    'fingerprint': obj.fingerprint,
-                    'error': e,
-                })
+        count = 0
+        for pk in queryset.values_list('pk', flat=True).iterator(chunk_size=ACTION_CHUNK_SIZE):
+            refresh_gpg_key.delay(pk)
+            count += 1
+
+        messages.info(request, _('Scheduled refresh of %(count)s key(s) from keyserver.') % {
+            'count': count,
+        })
     refresh.label = _('Refresh')
     refresh.short_description = _('Refresh keys from keyserver')
 
@@ -205,13 +282,16 @@ class GpgKeyAdmin(DjangoObjectActions, admin.ModelAdmin):
 @admin.register(Confirmation)
 class ConfirmationAdmin(admin.ModelAdmin):
     actions = ['resend']
+    autocomplete_fields = ('user', 'address', )
     list_display = ('key', 'user', 'address', 'purpose', 'to', 'expires', )
     list_filter = ('purpose', )
     list_select_related = ('user', 'address', )
+    paginator = EstimatedCountPaginator
     search_fields = ('key', 'to', 'user__username', 'user__email', )
+    show_full_result_count = False
 
     def resend(self, request, queryset):
-        resend_confirmations.delay(*queryset.values_list('pk', flat=True))
+        resend_confirmations.delay(list(queryset.values_list('pk', flat=True)))
     resend.short_description = _('Resend confirmations')
 
 
@@ -0,0 +1,23 @@
+# Generated by Django 2.1.2 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0018_auto_20180527_1400'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='confirmed',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='created_in_backend',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
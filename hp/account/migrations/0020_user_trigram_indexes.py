@@ -0,0 +1,37 @@
+from django.db import migrations
+
+# NOTE: Django implements "icontains" lookups (used by the admin search) as
+#       UPPER("column"::text) LIKE UPPER('%term%') on PostgreSQL, so the indexes use the same expression.
+TRIGRAM_INDEXES = (
+    ('account_user_username_trgm', 'username'),
+    ('account_user_email_trgm', 'email'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES:
+        schema_editor.execute('CREATE INDEX %s ON account_user USING gin (UPPER("%s"::text) gin_trgm_ops)' % (
+            name, column))
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name, _ in TRIGRAM_INDEXES:
+        schema_editor.execute('DROP INDEX IF EXISTS %s' % name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0019_auto_20261015_1200'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
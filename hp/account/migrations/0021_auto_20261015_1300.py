@@ -0,0 +1,18 @@
+# Generated by Django 2.1.2 on 2026-10-15 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0020_user_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userlogentry',
+            name='address',
+            field=models.GenericIPAddressField(blank=True, db_index=True, null=True),
+        ),
+    ]
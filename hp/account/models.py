@@ -22,6 +22,7 @@ from django.contrib.messages import constants as messages
 from django.core.mail import EmailMultiAlternatives
 from django.db import models
 from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
 from django.dispatch import receiver
 from django.template import Context
 from django.template import Template
@@ -43,6 +44,7 @@ from xmpp_backends.django.models import XmppBackendUser
 
 from antispam.models import BlockedEmail
 from antispam.models import BlockedIpAddress
+from antispam.utils import normalize_email
 from core.models import Address
 from core.models import BaseModel
 from core.models import CachedMessage
@@ -94,11 +96,11 @@ class User(XmppBackendUser, PermissionsMixin):
         default=REGISTRATION_WEBSITE, choices=REGISTRATION_CHOICES)
 
     # when the email was confirmed
-    confirmed = models.DateTimeField(null=True, blank=True)
+    confirmed = models.DateTimeField(null=True, blank=True, db_index=True)
 
     # If the user is created in the backend (not necessarily the same as confirmed, old users don't
     # have an email address).
-    created_in_backend = models.BooleanField(default=False)
+    created_in_backend = models.BooleanField(default=False, db_index=True)
 
     # If the user is blocked.
     blocked = models.BooleanField(default=False)
@@ -407,7 +409,7 @@ class UserLogEntry(BaseModel):
     objects = UserLogEntryManager.from_queryset(UserLogEntryQuerySet)()
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, models.CASCADE, related_name='log_entries')
-    address = models.GenericIPAddressField(null=True, blank=True)
+    address = models.GenericIPAddressField(null=True, blank=True, db_index=True)
     message = models.TextField()
     payload = JSONField(default=default_payload)
 
@@ -458,6 +460,18 @@ class GpgKey(BaseModel):
         return self.fingerprint
 
 
+@receiver(pre_save, sender=User)
+def set_normalized_email(sender, instance, update_fields=None, **kwargs):
+    # Saves that explicitly do not update the email address can't change the normalized address.
+    if update_fields is not None and 'email' not in update_fields:
+        return
+
+    if instance.email:
+        instance.normalized_email = normalize_email(instance.email)
+    else:
+        instance.normalized_email = ''
+
+
 @receiver(post_save, sender=User)
 def create_notifications(sender, instance, created, **kwargs):
     if created:
@@ -19,6 +19,14 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
+import reversion
+from xmpp_backends.base import UserNotFound
+from xmpp_backends.django import xmpp_backend
+
+from antispam.models import BlockedEmail
+from antispam.models import BlockedIpAddress
+from core.models import AddressActivity
+
 
 class UserQuerySet(models.QuerySet):
     def has_email(self):
@@ -44,6 +52,45 @@ class UserQuerySet(models.QuerySet):
     def not_blocked(self):
         return self.filter(blocked=False)
 
+    def block(self):
+        """Block all users in this queryset.
+
+        This is the bulk version of :py:meth:`User.block() <account.models.User.block>`: Users are
+        marked as blocked with a single ``UPDATE`` statement and every email and IP address is only
+        blocked once. If a revision is active, the blocked users are added to it.
+
+        Returns the list of blocked users.
+        """
+        users = list(self)
+        if not users:
+            return users
+
+        self.model.objects.filter(pk__in=[u.pk for u in users]).update(blocked=True)
+
+        # Block email addresses so they can't harm us again
+        for email in set(u.email for u in users if u.email):
+            BlockedEmail.objects.block(email)
+
+        # Block any address activities:
+        addresses = AddressActivity.objects.filter(user__in=users).values_list(
+            'address__address', flat=True).distinct()
+        for addr in addresses:
+            BlockedIpAddress.objects.block(addr)
+
+        add_to_revision = reversion.is_active() and reversion.is_registered(self.model)
+        for user in users:
+            user.blocked = True
+            if add_to_revision:
+                reversion.add_to_revision(user)
+
+            try:
+                xmpp_backend.block_user(username=user.node, domain=user.domain)
+            except UserNotFound:
+                pass
+
+        return users
+    block.queryset_only = True
+
     def host(self, hostname):
         return self.filter(username__endswith='@%s' % hostname)
 
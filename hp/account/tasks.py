@@ -42,6 +42,7 @@ from core.utils import format_timedelta
 
 from .constants import PURPOSE_SET_EMAIL
 from .models import Confirmation
+from .models import GpgKey
 from .models import UserLogEntry
 
 User = get_user_model()
@@ -181,19 +182,30 @@ def set_email_task(self, user_pk, to, language, address, fingerprint=None, key=N
 
 
 @shared_task
-def resend_confirmations(*conf_pks):
+def resend_confirmations(conf_pks):
     """Task to resend the passed confirmation keys.
 
     Usage::
 
         # Resend confirmation keys with primary keys 3, 5 and 10:
-        >>> resend_confirmations.delay(3, 5, 10)
+        >>> resend_confirmations.delay([3, 5, 10])
     """
-    for pk in conf_pks:
-        conf = Confirmation.objects.get(pk=pk)
+    for conf in Confirmation.objects.filter(pk__in=conf_pks).select_related('user'):
         conf.send()
 
 
+@shared_task
+def refresh_gpg_key(pk):
+    """Task to refresh the GPG key with the given primary key from the keyserver."""
+
+    key = GpgKey.objects.select_related('user').get(pk=pk)
+    try:
+        key.refresh()
+    except Exception as e:
+        log.error('Error refreshing %s: %s', key.fingerprint, e)
+        raise
+
+
 @shared_task
 def update_last_activity(random_update=50):
     # Update some random users with recent activity so we have at least a vague picture of
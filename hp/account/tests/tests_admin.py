@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the jabber.at homepage (https://github.com/jabber-at/hp).
+#
+# This project is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This project is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this project. If
+# not, see <http://www.gnu.org/licenses/>.
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Address
+from core.tests.base import TestCase
+
+from ..constants import PURPOSE_REGISTER
+from ..models import Confirmation
+from ..models import GpgKey
+
+User = get_user_model()
+
+
+class ChangelistQueriesTestCase(TestCase):
+    """Make sure that the number of queries for admin changelists does not depend on the number of rows."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create(username='admin@example.com', email='admin@example.com',
+                                         is_superuser=True)
+        self.address = Address.objects.create(address='127.0.0.1')
+        self.client = Client()
+        self.client.force_login(self.admin)
+        self.count = 0
+
+    def add_rows(self, count):
+        for i in range(self.count, self.count + count):
+            user = User.objects.create(username='user%s@example.com' % i, email='user%s@example.com' % i)
+            user.log('Test message.', address='127.0.0.1')
+            GpgKey.objects.create(user=user, fingerprint='%040d' % i, key='key')
+            Confirmation.objects.create(user=user, address=self.address, purpose=PURPOSE_REGISTER,
+                                        language='en', to=user.email)
+        self.count += count
+
+    def assertConstantQueries(self, viewname):
+        url = reverse(viewname)
+        self.add_rows(1)
+        self.assertEqual(self.client.get(url).status_code, 200)  # warm up any caches
+
+        with CaptureQueriesContext(connection) as one:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.add_rows(3)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.assertEqual(len(one), len(many))
+
+    def test_user(self):
+        self.assertConstantQueries('admin:account_user_changelist')
+
+    def test_userlogentry(self):
+        self.assertConstantQueries('admin:account_userlogentry_changelist')
+
+    def test_gpgkey(self):
+        self.assertConstantQueries('admin:account_gpgkey_changelist')
+
+    def test_confirmation(self):
+        self.assertConstantQueries('admin:account_confirmation_changelist')
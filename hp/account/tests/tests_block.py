@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the jabber.at homepage (https://github.com/jabber-at/hp).
+#
+# This project is free software: you can redistribute it and/or modify it under the terms of the
+# GNU General Public License as published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This project is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with this project. If
+# not, see <http://www.gnu.org/licenses/>.
+
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.test import override_settings
+from django.urls import reverse
+
+from reversion.models import Revision
+
+from antispam.models import BlockedEmail
+from core.tests.base import TestCase
+
+User = get_user_model()
+
+EMAIL = 'user@example.com'
+
+
+@override_settings(BLOCKED_EMAIL_TIMEOUT=None, BLOCKED_IPADDRESS_TIMEOUT=None)
+class BlockTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user1 = User.objects.create(username='user1@example.com', email=EMAIL,
+                                         normalized_email=EMAIL)
+        self.user2 = User.objects.create(username='user2@example.com', email=EMAIL,
+                                         normalized_email=EMAIL)
+        self.user3 = User.objects.create(username='user3@example.com', email='other@example.com',
+                                         normalized_email='other@example.com')
+
+    def test_queryset_block(self):
+        blocked = User.objects.filter(normalized_email=EMAIL).block()
+        self.assertCountEqual(blocked, [self.user1, self.user2])
+        self.assertTrue(all(u.blocked for u in blocked))
+
+        self.assertCountEqual(User.objects.blocked(), [self.user1, self.user2])
+        self.assertCountEqual(User.objects.not_blocked(), [self.user3])
+        self.assertTrue(BlockedEmail.objects.is_blocked(EMAIL))
+        self.assertFalse(BlockedEmail.objects.is_blocked('other@example.com'))
+
+    def test_queryset_block_no_email(self):
+        no_email = User.objects.create(username='user4@example.com', email='')
+
+        blocked = User.objects.filter(pk__in=[self.user1.pk, no_email.pk]).block()
+        self.assertCountEqual(blocked, [self.user1, no_email])
+        self.assertCountEqual(User.objects.blocked(), [self.user1, no_email])
+        self.assertTrue(BlockedEmail.objects.is_blocked(EMAIL))
+        self.assertEqual(BlockedEmail.objects.count(), 1)
+
+    def test_queryset_block_empty(self):
+        self.assertEqual(User.objects.none().block(), [])
+        self.assertEqual(User.objects.blocked().count(), 0)
+
+
+@override_settings(BLOCKED_EMAIL_TIMEOUT=None, BLOCKED_IPADDRESS_TIMEOUT=None)
+class BlockAdminTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create(username='admin@example.com', email='admin@example.com',
+                                         is_superuser=True)
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+        self.user1 = User.objects.create(username='user1@example.com', email=EMAIL)
+        self.user2 = User.objects.create(username='user2@example.com', email='User+foo@example.com')
+        self.user3 = User.objects.create(username='user3@example.com', email='other@example.com')
+        self.no_email1 = User.objects.create(username='user4@example.com', email='')
+        self.no_email2 = User.objects.create(username='user5@example.com', email='')
+
+    def assertBlocked(self, *users):
+        self.assertCountEqual(User.objects.blocked(), users)
+
+    def block_users(self, *users):
+        url = reverse('admin:account_user_changelist')
+        return self.client.post(url, {
+            'action': 'block_users',
+            'index': 0,
+            helpers.ACTION_CHECKBOX_NAME: [u.pk for u in users],
+        })
+
+    def block_user(self, user):
+        url = reverse('admin:account_user_actions', kwargs={'pk': user.pk, 'tool': 'block_user'})
+        return self.client.post(url)
+
+    def test_block_users(self):
+        response = self.block_users(self.user1)
+        self.assertEqual(response.status_code, 302)
+
+        # user2 has the same normalized email address, so it's blocked as well
+        self.assertBlocked(self.user1, self.user2)
+        self.assertEqual(Revision.objects.count(), 1)
+        self.assertEqual(Revision.objects.get().version_set.count(), 2)
+
+    def test_block_users_multiple(self):
+        response = self.block_users(self.user1, self.user3, self.no_email1)
+        self.assertEqual(response.status_code, 302)
+
+        # no_email2 shares the empty email address with no_email1 but must not be blocked
+        self.assertBlocked(self.user1, self.user2, self.user3, self.no_email1)
+        self.assertEqual(Revision.objects.count(), 1)
+        self.assertEqual(Revision.objects.get().version_set.count(), 4)
+
+    def test_block_user(self):
+        response = self.block_user(self.user2)
+        self.assertEqual(response.status_code, 302)
+
+        self.assertBlocked(self.user1, self.user2)
+        self.assertEqual(Revision.objects.count(), 1)
+        self.assertEqual(Revision.objects.get().version_set.count(), 2)
+
+    def test_block_user_no_email(self):
+        response = self.block_user(self.no_email1)
+        self.assertEqual(response.status_code, 302)
+
+        self.assertBlocked(self.no_email1)
+        self.assertEqual(Revision.objects.count(), 1)
+        self.assertEqual(Revision.objects.get().version_set.count(), 1)
@@ -58,7 +58,6 @@ from xmpp_http_upload.utils import get_config
 from antispam.exceptions import BlockedException
 from antispam.models import BlockedEmail
 from antispam.models import BlockedIpAddress
-from antispam.utils import normalize_email
 from core.constants import ACTIVITY_FAILED_LOGIN
 from core.constants import ACTIVITY_REGISTER
 from core.constants import ACTIVITY_RESEND_CONFIRMATION
@@ -197,9 +196,6 @@ class RegistrationView(AntiSpamMixin, AnonymousRequiredMixin, HomepageViewMixin,
             response = super(RegistrationView, self).form_valid(form)
             user = self.object
 
-            # Compute the normalized email address
-            user.normalized_email = normalize_email(user.email)
-
             # save default language
             user.default_language = lang
             user.save()
@@ -503,9 +499,6 @@ class SetEmailView(AntiSpamMixin, LoginRequiredMixin, AccountPageMixin, FormView
         with transaction.atomic():
             request.user.email = form.cleaned_data['email']
 
-            # Compute the normalized email address
-            request.user.normalized_email = normalize_email(user.email)
-
             request.user.save()
 
             # Remove existing confirmation keys for different email addresses, otherwise the user might be
@@ -587,9 +580,6 @@ class ConfirmSetEmailView(LoginRequiredMixin, RedirectView):
         key = get_object_or_404(qs, key=kwargs['key'])
 
         user.email = key.to
-        # Compute the normalized email address
-        user.normalized_email = normalize_email(user.email)
-
         user.confirmed = timezone.now()
 
         with transaction.atomic():
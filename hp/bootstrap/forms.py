@@ -44,31 +44,40 @@ class BootstrapFormMixin(object):
         if 'button_template' in 'kwargs':
             self.button_template = kwargs.pop('button_template')
 
+        self._buttons = self.get_default_buttons()
+        self._buttons.update(kwargs.pop('buttons', {}))
+
         super().__init__(*args, **kwargs)
 
         input_columns = input_columns or self.input_columns
-        if input_columns is not None:
-            for key, field in self.fields.items():
-                field.input_columns = input_columns
-
         label_columns = label_columns or self.label_columns
-        if label_columns is not None:
-            for key, field in self.fields.items():
-                field.label_columns = label_columns
+        if input_columns is not None or label_columns is not None:
+            for field in self.fields.values():
+                if input_columns is not None:
+                    field.input_columns = input_columns
+                if label_columns is not None:
+                    field.label_columns = label_columns
+
+    @classmethod
+    def get_default_buttons(cls):
+        """Get a copy of ``default_buttons`` merged from all classes in the MRO.
 
-        buttons = {}
-        for c in reversed(self.__class__.__mro__):
-            buttons.update(getattr(c, 'default_buttons', {}))
-        buttons.update(kwargs.pop('buttons', {}))
-        self._buttons = buttons
+        The merged dictionary is computed only once per class.
+        """
+        if '_merged_default_buttons' not in cls.__dict__:
+            buttons = {}
+            for c in reversed(cls.__mro__):
+                buttons.update(getattr(c, 'default_buttons', {}))
+            cls._merged_default_buttons = buttons
+        return dict(cls._merged_default_buttons)
 
     def get_button_order(self):
         return self.button_order
 
     def buttons(self):
         renderer = self.renderer or get_default_renderer()
-        order = self.get_button_order()
-        buttons = sorted(self._buttons.items(), key=lambda t: order.index(t[0]) if t[0] in order else -1)
+        order = {name: i for i, name in enumerate(self.get_button_order())}
+        buttons = sorted(self._buttons.items(), key=lambda t: order.get(t[0], -1))
 
         context = {'buttons': buttons, 'form': self}
         return mark_safe(renderer.render(self.button_template, context))
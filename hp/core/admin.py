@@ -15,6 +15,9 @@
 
 from django.contrib import admin
 from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from mptt.admin import DraggableMPTTAdmin
@@ -27,6 +30,46 @@ from .models import MenuItem
 User = get_user_model()
 
 
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses the table statistics of the database for unfiltered querysets.
+
+    Counting all rows of a large table is slow (at least with InnoDB and PostgreSQL), so this paginator
+    uses the row estimate kept by the database instead. The estimate is only used for large tables and
+    unfiltered querysets, all other querysets are counted as usual.
+    """
+
+    # Use exact counts for tables with fewer rows, the estimate is usually far off for small tables.
+    min_estimate = 10000
+
+    def get_estimate(self):
+        connection = connections[self.object_list.db]
+        table = self.object_list.model._meta.db_table
+
+        if connection.vendor == 'postgresql':
+            query = 'SELECT reltuples FROM pg_class WHERE relname = %s'
+        elif connection.vendor == 'mysql':
+            query = 'SELECT table_rows FROM information_schema.tables ' \
+                    'WHERE table_schema = DATABASE() AND table_name = %s'
+        else:
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, [table])
+            row = cursor.fetchone()
+
+        if row is None or row[0] is None:
+            return None
+        return int(row[0])
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = self.get_estimate()
+            if estimate is not None and estimate >= self.min_estimate:
+                return estimate
+        return super().count
+
+
 class BaseModelAdmin(admin.ModelAdmin):
     def get_readonly_fields(self, request, obj=None):
         fields = list(super(BaseModelAdmin, self).get_readonly_fields(request, obj=obj))
@@ -98,6 +141,7 @@ class AddressAdmin(admin.ModelAdmin):
 
 @admin.register(AddressActivity)
 class AddressActivityAdmin(admin.ModelAdmin):
+    autocomplete_fields = ('user', 'address', )
     list_filter = ('activity', )
     list_display = ('address', 'activity', 'user', 'note', 'timestamp', )
     list_select_related = ('user', 'address', )
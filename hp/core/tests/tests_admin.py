@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the jabber.at homepage (https://github.com/jabber-at/hp).
+#
+# This project is free software: you can redistribute it and/or modify it under the terms of the GNU General
+# Public License as published by the Free Software Foundation, either version 3 of the License, or (at your
+# option) any later version.
+#
+# This project is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the
+# implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+#
+# You should have received a copy of the GNU General Public License along with this project. If not, see
+# <http://www.gnu.org/licenses/>.
+
+from unittest import mock
+
+from ..admin import EstimatedCountPaginator
+from ..models import Address
+from .base import TestCase
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    def setUp(self):
+        super().setUp()
+        Address.objects.create(address='127.0.0.1')
+        Address.objects.create(address='127.0.0.2')
+
+    def count(self, queryset, estimate):
+        paginator = EstimatedCountPaginator(queryset, 10)
+        with mock.patch.object(EstimatedCountPaginator, 'get_estimate', return_value=estimate) as m:
+            return paginator.count, m
+
+    def test_estimate(self):
+        min_estimate = EstimatedCountPaginator.min_estimate
+        qs = Address.objects.order_by('pk')
+
+        self.assertEqual(self.count(qs, min_estimate)[0], min_estimate)
+        self.assertEqual(self.count(qs, min_estimate + 1)[0], min_estimate + 1)
+
+    def test_small_estimate(self):
+        qs = Address.objects.order_by('pk')
+        self.assertEqual(self.count(qs, EstimatedCountPaginator.min_estimate - 1)[0], 2)
+        self.assertEqual(self.count(qs, None)[0], 2)
+
+    def test_filtered(self):
+        qs = Address.objects.filter(address='127.0.0.1').order_by('pk')
+        count, mocked = self.count(qs, EstimatedCountPaginator.min_estimate)
+        self.assertEqual(count, 1)
+        mocked.assert_not_called()
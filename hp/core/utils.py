@@ -220,12 +220,24 @@ def mailformat(text, width=78):
     return '\n'.join(ps).strip()
 
 
+def _set_revision_info(user, comment):
+    if user is not None:
+        reversion.set_user(user)
+    if comment is not None:
+        reversion.set_comment(comment)
+
+
 @contextmanager
 def version(user=None, comment=None):
-    with reversion.create_revision():
-        yield
+    """Context manager to record changes in a revision.
 
-        if user is not None:
-            reversion.set_user(user)
-        if comment is not None:
-            reversion.set_comment(comment)
+    If a revision is already active (e.g. in views of a ``VersionAdmin``), changes are added to that
+    revision instead of creating a nested one.
+    """
+    if reversion.is_active():
+        yield
+        _set_revision_info(user, comment)
+    else:
+        with reversion.create_revision():
+            yield
+            _set_revision_info(user, comment)